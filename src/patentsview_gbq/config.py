@@ -10,6 +10,9 @@ BLD = ROOT / "bld"
 RESOURCES = ROOT / "resources"
 SCHEMAS = RESOURCES / "schemas"
 
+# Written by task_02 in each converted dir, one JSON line per parquet file
+PARQUET_MANIFEST = "manifest.jsonl"
+
 # Ensure directories exist
 BLD.mkdir(exist_ok=True)
 RESOURCES.mkdir(exist_ok=True)
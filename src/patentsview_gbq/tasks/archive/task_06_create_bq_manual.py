@@ -4,6 +4,10 @@ import json
 import subprocess
 from pathlib import Path
 import os
+
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import bigquery
+
 from ...config import SCHEMAS, DATASETS, BLD, BQ_PROJECT_ID, VERSION, get_gcs_bucket
 
 # Get dataset from env var or default to 'granted'
@@ -44,7 +48,9 @@ def task_create_bigquery_tables_manual() -> None:
         manual_tables = [t.strip() for t in manual_tables.split(",")]
         print(f"Processing only these tables: {manual_tables}")
     
-    # Create BigQuery tables
+    # Submit all load jobs first; BigQuery runs them concurrently
+    client = bigquery.Client(project=BQ_PROJECT_ID)
+    load_jobs = {}
     for schema_file in schema_files:
         # Extract table name from schema file name and remove "schema_" prefix if present
         table_name = schema_file.stem
@@ -68,20 +74,25 @@ def task_create_bigquery_tables_manual() -> None:
             continue
 
         # Load data into BigQuery with schema (Parquet format)
-        bq_load_command = [
-            'bq', 'load',
-            '--source_format=PARQUET',
-            '--replace',
-            f'--project_id={BQ_PROJECT_ID}',
-            f'--schema={schema_file}',  # Use pre-created schema for descriptions
-            bq_table_name,
-            gcs_file_path
-        ]
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            schema=client.schema_from_json(schema_file),  # Use pre-created schema for descriptions
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
 
         try:
             print(f"Creating table {bq_table_name} with schema {schema_file}")
-            subprocess.run(bq_load_command, check=True)
-            print(f"Data uploaded successfully to {bq_table_name}")
-        except subprocess.CalledProcessError as e:
+            load_jobs[bq_table_name] = client.load_table_from_uri(
+                gcs_file_path, bq_table_name, job_config=job_config
+            )
+        except GoogleAPICallError as e:
             print(f"Error uploading {table_name}: {e}")
-            continue 
\ No newline at end of file
+            continue
+
+    # Wait for the load jobs to finish
+    for bq_table_name, job in load_jobs.items():
+        try:
+            job.result()
+            print(f"Data uploaded successfully to {bq_table_name}")
+        except GoogleAPICallError as e:
+            print(f"Error uploading {bq_table_name}: {e}")
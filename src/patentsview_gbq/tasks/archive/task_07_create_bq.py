@@ -1,19 +1,73 @@
 """Task for creating BigQuery tables."""
 import pytask
+import hashlib
 import json
-import subprocess
 from pathlib import Path
 import os
 
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import bigquery, storage
+
 from ...config import DATASETS, BLD, BQ_PROJECT_ID, VERSION, get_gcs_bucket
 
 # Get dataset from env var or default to 'granted'
 DATASET = os.getenv("CONFIG_TYPE", "granted")
 converted_dir = BLD / "converted" / DATASET
 metadata_dir_manual = BLD / "metadata_manual" / DATASET
+schema_dir = BLD / "schemas" / DATASET
 gcs_bucket = get_gcs_bucket(DATASET, suffix="_parquet")
 bq_dataset = DATASETS[DATASET]["bq_dataset"]
 
+# Map metadata types to BigQuery types; anything else is loaded as STRING
+_TYPE_MAP = {
+    'INTEGER': 'INTEGER',
+    'INT': 'INTEGER',
+    'FLOAT': 'FLOAT',
+    'DOUBLE': 'FLOAT',
+    'NUMERIC': 'FLOAT',
+    'DATE': 'DATE',
+    'TIMESTAMP': 'TIMESTAMP',
+    'DATETIME': 'TIMESTAMP',
+}
+
+
+def write_schema_file(table_name: str, variables: dict) -> Path:
+    """Write the BigQuery schema for a table, re-using it if the metadata is unchanged.
+
+    The file name includes a hash of the table's variable metadata, so a schema
+    is only regenerated when its descriptions or types change.
+    """
+    digest = hashlib.sha256(
+        json.dumps([table_name, variables], sort_keys=True).encode()
+    ).hexdigest()[:16]
+    schema_path = schema_dir / f"{table_name}_{digest}.json"
+    if schema_path.exists():
+        return schema_path
+
+    schema_fields = [
+        {
+            'name': var_name,
+            'type': _TYPE_MAP.get(var_info.get('type', 'STRING').upper(), 'STRING'),
+            'description': var_info.get('description', '')
+        }
+        for var_name, var_info in variables.items()
+    ]
+
+    schema_dir.mkdir(parents=True, exist_ok=True)
+    with open(schema_path, 'w') as f:
+        json.dump(schema_fields, f, indent=2)
+    return schema_path
+
+
+def list_gcs_files(gcs_path: str) -> set[str]:
+    """List all gs:// URIs under a 'bucket/prefix' path with a single GCS listing."""
+    bucket_name, _, prefix = gcs_path.partition("/")
+    client = storage.Client(project=BQ_PROJECT_ID)
+    return {
+        f"gs://{bucket_name}/{blob.name}"
+        for blob in client.list_blobs(bucket_name, prefix=f"{prefix}/")
+    }
+
 @pytask.mark.skip()
 @pytask.task(after="task_upload_to_gcs")
 def task_create_bigquery_tables(
@@ -42,65 +96,45 @@ def task_create_bigquery_tables(
         print(f"Processing only the first {max_tables} tables")
         tables = tables[:max_tables]
     
-    # Create BigQuery tables
+    # List files in GCS once instead of probing each table with gsutil
+    gcs_files = list_gcs_files(gcs_bucket)
+
+    # Submit all load jobs first; BigQuery runs them concurrently
+    client = bigquery.Client(project=BQ_PROJECT_ID)
+    load_jobs = {}
     for table_name in tables:
         versioned_table_name = f"{table_name}_{VERSION}.parquet"
         gcs_file_path = f"gs://{gcs_bucket}/{versioned_table_name}"
         bq_table_name = f"{bq_dataset}.{table_name}_{VERSION}"
 
         # Check if file exists in GCS
-        try:
-            subprocess.run(['gsutil', 'ls', gcs_file_path], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        except subprocess.CalledProcessError:
+        if gcs_file_path not in gcs_files:
             print(f"File '{gcs_file_path}' not found in GCS. Skipping.")
             continue
 
-        # Generate schema from variable descriptions
-        schema_fields = []
-        for var_name, var_info in variable_descriptions[table_name].items():
-            field_type = var_info.get('type', 'STRING').upper()
-            # Map common types to BigQuery types
-            if field_type in ['INTEGER', 'INT']:
-                bq_type = 'INTEGER'
-            elif field_type in ['FLOAT', 'DOUBLE', 'NUMERIC']:
-                bq_type = 'FLOAT'
-            elif field_type in ['DATE']:
-                bq_type = 'DATE'
-            elif field_type in ['TIMESTAMP', 'DATETIME']:
-                bq_type = 'TIMESTAMP'
-            else:
-                bq_type = 'STRING'
-            
-            schema_fields.append({
-                'name': var_name,
-                'type': bq_type,
-                'description': var_info.get('description', '')
-            })
-
-        # Create temporary schema file
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as schema_file:
-            json.dump(schema_fields, schema_file, indent=2)
-            schema_path = schema_file.name
-
-        # Load data into BigQuery from Parquet
-        bq_load_command = [
-            'bq', 'load',
-            '--source_format=PARQUET',
-            '--replace',
-            f'--project_id={BQ_PROJECT_ID}',
-            f'--schema={schema_path}',  # Provide schema with descriptions
-            bq_table_name,
-            gcs_file_path
-        ]
+        # Generate (or re-use) schema from variable descriptions
+        schema_path = write_schema_file(table_name, variable_descriptions[table_name])
+
+        # Load data into BigQuery from Parquet, with schema for descriptions
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            schema=client.schema_from_json(schema_path),
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
 
         try:
             print(f"Creating table {bq_table_name} with schema from metadata")
-            subprocess.run(bq_load_command, check=True)
-            print(f"Data uploaded successfully to {bq_table_name}")
-        except subprocess.CalledProcessError as e:
+            load_jobs[table_name] = client.load_table_from_uri(
+                gcs_file_path, bq_table_name, job_config=job_config
+            )
+        except GoogleAPICallError as e:
             print(f"Error uploading {table_name}: {e}")
             continue
-        finally:
-            # Clean up temporary schema file
-            Path(schema_path).unlink()
+
+    # Wait for the load jobs to finish
+    for table_name, job in load_jobs.items():
+        try:
+            job.result()
+            print(f"Data uploaded successfully to {bq_dataset}.{table_name}_{VERSION}")
+        except GoogleAPICallError as e:
+            print(f"Error uploading {table_name}: {e}")
@@ -2,19 +2,29 @@
 from pathlib import Path
 from typing import Annotated
 from urllib.parse import urljoin
+import functools
+import json
+import shutil
 import time
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+from lxml import html
 from pytask import Product, task
 
 from ..config import BLD, DATASETS
 
+# Re-use a cached zip listing for this long before fetching the download page again
+ZIP_LIST_MAX_AGE_SECONDS = 24 * 60 * 60
 
+# Buffer size for copying download streams to disk
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024  # 1 MiB
+
+
+@functools.cache
 def get_session() -> requests.Session:
-    """Create a requests session with retry logic."""
+    """Return a requests session with retry logic, shared by all requests in this process."""
     session = requests.Session()
     retry = Retry(
         total=5,
@@ -22,13 +32,13 @@ def get_session() -> requests.Session:
         status_forcelist=[403, 429, 500, 502, 503, 504],
         allowed_methods=["GET"],
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=16)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
 
-def get_zip_files_from_url(base_url: str) -> list[str]:
+def get_zip_files_from_url(base_url: str) -> list[tuple[str, str]]:
     """Get list of zip file names from PatentsView download page."""
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
@@ -52,15 +62,27 @@ def get_zip_files_from_url(base_url: str) -> list[str]:
     response = session.get(base_url, headers=headers, timeout=30)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    tree = html.fromstring(response.content)
     zip_files = []
-    for link in soup.find_all("a", href=True):
-        href = link["href"]
-        if href.endswith(".zip"):
-            # Extract just the filename from the URL/path
-            filename = Path(href).name
-            zip_files.append((filename, href))  # Store both filename and full URL
+    for href in tree.xpath('//a[substring(@href, string-length(@href) - 3) = ".zip"]/@href'):
+        # Extract just the filename from the URL/path
+        filename = Path(href).name
+        zip_files.append((filename, href))  # Store both filename and full URL
+
+    return zip_files
 
+
+def get_cached_zip_files(base_url: str, cache_file: Path) -> list[tuple[str, str]]:
+    """Get zip files for a download page, re-using a listing cached within the last day."""
+    if cache_file.exists() and time.time() - cache_file.stat().st_mtime < ZIP_LIST_MAX_AGE_SECONDS:
+        cached = json.loads(cache_file.read_text())
+        if cached["url"] == base_url:
+            return [tuple(item) for item in cached["zip_files"]]
+
+    zip_files = get_zip_files_from_url(base_url)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps({"url": base_url, "zip_files": zip_files}, indent=2))
     return zip_files
 
 
@@ -72,7 +94,9 @@ def task_download_datasets() -> None:
         raw_dir.mkdir(parents=True, exist_ok=True)
 
         # Discover zip files for this dataset
-        zip_files = get_zip_files_from_url(dataset_config["base_url"])
+        zip_files = get_cached_zip_files(
+            dataset_config["base_url"], BLD / "cache" / f"{dataset_name}_ziplist.json"
+        )
 
         # Generate a task for each zip file
         for filename, href in zip_files:
@@ -103,14 +127,12 @@ def task_download_datasets() -> None:
                     "Upgrade-Insecure-Requests": "1",
                 }
 
-                # Add delay between downloads
-                time.sleep(1)
-
                 session = get_session()
                 with session.get(url, headers=headers, stream=True, timeout=60) as r:
                     r.raise_for_status()
+                    # Let urllib3 undo any gzip/deflate transfer encoding
+                    r.raw.decode_content = True
                     with open(path, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            f.write(chunk)
+                        shutil.copyfileobj(r.raw, f, length=DOWNLOAD_BUFFER_SIZE)
 
                 print(f"Downloaded {path}")
@@ -1,61 +1,86 @@
 """Task for extracting patent data and converting to Parquet."""
-import sys
 import csv
-
-# MUST set this before pandas/csv readers are triggered
-csv.field_size_limit(sys.maxsize)
-
-import io
+import functools
 import json
 import os
 import zipfile
 from pathlib import Path
-from typing import Annotated, Optional, Set
+from typing import Annotated, FrozenSet, Optional, Union
 
-import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.fs as pafs
 import pyarrow.parquet as pq
 import pytask
 from pytask import DirectoryNode, Product, task
 
-from ..config import BLD, VERSION, DATASETS, RESOURCES
+from ..config import BLD, VERSION, DATASETS, PARQUET_MANIFEST, RESOURCES, get_gcs_bucket
+
+# PARQUET_TO_GCS=1 writes parquet straight to the GCS parquet bucket and creates
+# the upload marker, skipping the local copy and task_04_upload_gcs_parquet
+PARQUET_TO_GCS = os.getenv("PARQUET_TO_GCS") == "1"
+marker_dir = BLD / "gcs"
 
 # Default N_COLUMNS - can be overridden per dataset if needed
 N_COLUMNS = None
 
-# Heuristic for "large" TSVs (uncompressed size in bytes)
-# ZipInfo.file_size is the uncompressed size.
-SIZE_THRESHOLD_BYTES = 200 * 1024 * 1024  # 200 MB
+# Bytes of TSV handed to the Arrow tokenizer per record batch
+BLOCK_SIZE = 64 << 20  # 64 MB
 
-# Default chunk size for streaming
-DEFAULT_CHUNKSIZE = 500_000
+# Upper bound on rows per Parquet row group (BigQuery loads row groups in parallel)
+ROW_GROUP_SIZE = 1_000_000
 
+# ParquetWriter settings: ZSTD + dictionary encoding keeps the high-cardinality
+# string tables (ids, names) small, which speeds up both GCS upload and BQ load
+PARQUET_WRITER_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+    "data_page_size": 2 * 1024 * 1024,
+    "write_statistics": True,
+}
 
-def _strip_outer_quotes(df: pd.DataFrame) -> pd.DataFrame:
-    """Strip surrounding double quotes from string columns."""
-    for col in df.columns:
-        if df[col].dtype == "object":
-            df[col] = df[col].apply(
-                lambda x: x[1:-1]
-                if isinstance(x, str) and x.startswith('"') and x.endswith('"')
-                else x
-            )
-    return df
+
+def _read_header(tsv_file) -> list[str]:
+    """Read the header line from a binary TSV stream and return the column names."""
+    # utf-8-sig drops a leading BOM so it doesn't end up in the first column name
+    header = tsv_file.readline().decode("utf-8-sig").rstrip("\r\n")
+    return next(csv.reader([header], delimiter="\t", quotechar='"'))
+
+
+def _string_column_indices(schema: pa.Schema) -> list[int]:
+    """Get positions of the string columns in a schema."""
+    return [i for i, field in enumerate(schema) if pa.types.is_string(field.type)]
+
+
+def _strip_outer_quotes(batch: pa.RecordBatch, string_columns: list[int]) -> pa.RecordBatch:
+    """Strip surrounding double quotes that survive CSV unquoting in string columns."""
+    for i in string_columns:
+        column = batch.column(i)
+        quoted = pc.and_(pc.starts_with(column, '"'), pc.ends_with(column, '"'))
+        if pc.any(quoted).as_py():
+            column = pc.if_else(quoted, pc.utf8_slice_codeunits(column, 1, -1), column)
+            batch = batch.set_column(i, batch.schema.field(i), column)
+    return batch
 
 
-def _apply_column_limit(df: pd.DataFrame) -> pd.DataFrame:
-    """Optionally trim DataFrame to first N_COLUMNS."""
+def _apply_column_limit(column_names: list[str]) -> list[str]:
+    """Optionally trim column names to the first N_COLUMNS."""
     if N_COLUMNS is not None:
-        if df.shape[1] < N_COLUMNS:
+        if len(column_names) < N_COLUMNS:
             raise ValueError(
-                f"Expected at least {N_COLUMNS} columns, but got {df.shape[1]}"
+                f"Expected at least {N_COLUMNS} columns, but got {len(column_names)}"
             )
-        df = df.iloc[:, :N_COLUMNS]
-    return df
+        column_names = column_names[:N_COLUMNS]
+    return column_names
 
 
-def _get_column_types(table_name: str, dataset: str) -> tuple[Optional[Set[str]], Optional[Set[str]]]:
+@functools.lru_cache(maxsize=None)
+def _get_column_types(table_name: str, dataset: str) -> tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]]:
     """Get sets of date and integer column names from schema file if it exists.
+
+    Cached per (table_name, dataset), so each schema file is parsed once per process.
     
     Returns:
         Tuple of (date_columns, integer_columns), either can be None if schema doesn't exist
@@ -69,14 +94,14 @@ def _get_column_types(table_name: str, dataset: str) -> tuple[Optional[Set[str]]
     try:
         with open(schema_file) as f:
             schema = json.load(f)
-        date_columns = {
+        date_columns = frozenset(
             field["name"] for field in schema 
             if field.get("type") == "DATE"
-        }
-        integer_columns = {
+        )
+        integer_columns = frozenset(
             field["name"] for field in schema 
             if field.get("type") == "INTEGER"
-        }
+        )
         return (
             date_columns if date_columns else None,
             integer_columns if integer_columns else None
@@ -85,161 +110,331 @@ def _get_column_types(table_name: str, dataset: str) -> tuple[Optional[Set[str]]
         return None, None
 
 
-def _parse_date_columns(df: pd.DataFrame, date_columns: Optional[Set[str]]) -> pd.DataFrame:
-    """Parse date columns from string format to date32 for proper parquet serialization."""
-    if date_columns is None:
-        return df
+def _parse_dates(column: pa.Array) -> pa.Array:
+    """Parse YYYY-MM-DD strings to date32, turning invalid dates into nulls.
 
-    for col in date_columns:
-        if col in df.columns:
-            # Parse dates and convert to Python date objects
-            # pyarrow will serialize these as DATE32 (INT32) in parquet
-            df[col] = pd.to_datetime(
-                df[col],
-                format='%Y-%m-%d',
-                errors='coerce'
-            ).dt.date
+    Like ``pd.to_datetime(format="%Y-%m-%d", errors="coerce")``, including dates
+    without zero padding (1976-1-6); the strftime round trip rejects dates strptime
+    would roll over (e.g. 2020-02-30). Unlike pandas, dates after 2262-04-11 (the
+    end of its nanosecond range) are kept rather than nulled.
+    """
+    # Zero-pad single-digit months and days so the round trip compares like with like
+    text = pc.replace_substring_regex(
+        pc.utf8_trim_whitespace(column), r"-(\d)\b", r"-0\1"
+    )
+    parsed = pc.strptime(text, format="%Y-%m-%d", unit="s", error_is_null=True)
+    valid = pc.equal(pc.strftime(parsed, format="%Y-%m-%d"), text)
+    return pc.if_else(valid, parsed, None).cast(pa.date32())
 
-    return df
 
+def _parse_integers(column: pa.Array) -> pa.Array:
+    """Cast integer strings to int64, turning anything else (e.g. 'US') into nulls.
 
-def _parse_integer_columns(df: pd.DataFrame, integer_columns: Optional[Set[str]]) -> pd.DataFrame:
-    """Parse integer columns from string format to int64 for proper parquet serialization."""
-    if integer_columns is None:
-        return df
-    
-    for col in integer_columns:
-        if col in df.columns:
-            # Convert to numeric, coercing errors to NaN (results in float64)
-            numeric_series = pd.to_numeric(df[col], errors='coerce')
-            
-            # Check if all non-NaN values are whole numbers (integers)
-            # If so, convert to Int64; otherwise keep as float64
-            non_null_mask = numeric_series.notna()
-            if non_null_mask.any():
-                # Check if all non-null values are whole numbers
-                # Use a small epsilon to handle floating point precision issues
-                non_null_values = numeric_series[non_null_mask]
-                # Check if values are close to their floor (within floating point precision)
-                is_whole = (non_null_values - non_null_values.round()).abs() < 1e-10
-                if is_whole.all():
-                    # All values are integers (or very close), safe to convert to Int64
-                    # Round first to ensure we have exact integers
-                    df[col] = numeric_series.round().astype('Int64')
-                else:
-                    # Contains non-integer floats, keep as float64
-                    # This shouldn't happen for INTEGER columns, but handle gracefully
-                    df[col] = numeric_series
-            else:
-                # All NaN, can safely convert to Int64
-                df[col] = numeric_series.astype('Int64')
-    
-    return df
+    Like ``pd.to_numeric(errors="coerce")`` followed by the baseline's whole-number
+    check: '+5' and '12.0' become 5 and 12. Values beyond 18 digits are treated as
+    invalid rather than overflowing int64, and exponents (1e3) are not parsed.
+    """
+    # Drop a leading '+' and a zero fraction, neither of which the int64 cast accepts
+    text = pc.replace_substring_regex(
+        pc.utf8_trim_whitespace(column), r"^\+(\d)|\.0*$", r"\1"
+    )
+    valid = pc.match_substring_regex(text, r"^-?\d{1,18}$")
+    return pc.if_else(valid, text, None).cast(pa.int64())
+
+
+# Parsers for columns read as strings and written with a schema type
+_COLUMN_PARSERS = {
+    pa.date32(): _parse_dates,
+    pa.int64(): _parse_integers,
+}
+
+
+def _typed_schema(
+    schema: pa.Schema,
+    date_columns: Optional[FrozenSet[str]],
+    integer_columns: Optional[FrozenSet[str]],
+) -> pa.Schema:
+    """Get the schema written to Parquet: DATE columns become date32, INTEGER int64."""
+    column_types = dict.fromkeys(date_columns or (), pa.date32())
+    column_types.update(dict.fromkeys(integer_columns or (), pa.int64()))
+    return pa.schema(
+        field.with_type(column_types.get(field.name, field.type)) for field in schema
+    )
+
+
+def _parse_typed_columns(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Parse the string columns whose type differs in ``schema``, with null on error."""
+    for i, field in enumerate(schema):
+        if field.type != batch.schema.field(i).type:
+            batch = batch.set_column(i, field, _COLUMN_PARSERS[field.type](batch.column(i)))
+    return batch
+
+
+def _pad_short_rows(
+    rows: list[str], column_names: list[str], schema: pa.Schema
+) -> pa.RecordBatch:
+    """Parse rows with fewer fields than the header, padding the missing fields with nulls.
+
+    pandas padded such rows; Arrow's CSV reader can only skip them, so they are
+    collected by the reader's ``invalid_row_handler`` and parsed here instead.
+    """
+    positions = {name: i for i, name in enumerate(column_names)}
+    records = [
+        fields + [None] * (len(column_names) - len(fields))
+        for fields in csv.reader(rows, delimiter="\t", quotechar='"')
+    ]
+    return pa.RecordBatch.from_pydict(
+        {field.name: [r[positions[field.name]] for r in records] for field in schema},
+        schema=schema,
+    )
+
+
+def _build_convert_options(column_names: list[str]) -> pv.ConvertOptions:
+    """Read every column as a string (never null), mirroring ``dtype=str``.
+
+    DATE / INTEGER columns are parsed afterwards by ``_parse_typed_columns``, so
+    values that don't parse become nulls instead of failing the file.
+    """
+    return pv.ConvertOptions(
+        column_types={name: pa.string() for name in column_names},
+        include_columns=column_names,
+        strings_can_be_null=False,
+    )
 
 
 def _write_parquet_streaming(
     tsv_stream,
-    parquet_path: Path,
+    parquet_path: Union[Path, str],
     log_prefix: str,
-    chunksize: int = DEFAULT_CHUNKSIZE,
-    date_columns: Optional[Set[str]] = None,
-    integer_columns: Optional[Set[str]] = None,
-) -> None:
-    """Read a TSV stream in chunks and write a single Parquet file."""
-    reader = pd.read_csv(
-        tsv_stream,
-        sep="\t",
-        quoting=csv.QUOTE_MINIMAL,
-        engine="python",
-        dtype=str,
-        keep_default_na=False,
-        na_values=[],
-        chunksize=chunksize,
-    )
+    date_columns: Optional[FrozenSet[str]] = None,
+    integer_columns: Optional[FrozenSet[str]] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+) -> tuple[int, int]:
+    """Stream a binary TSV into a single Parquet file, one record batch at a time.
 
-    writer = None
+    Args:
+        tsv_stream: Binary TSV stream supporting ``peek`` (e.g. an open zip member)
+        parquet_path: Local path, or a 'bucket/path' string when ``filesystem`` is given
+        filesystem: Optional Arrow filesystem (e.g. GCS) to write the file to
+
+    Returns:
+        Tuple of (rows, columns) written
+    """
+    column_names = _read_header(tsv_stream)
+    included_columns = _apply_column_limit(column_names)
+
+    # Rows with fewer fields than the header; any other invalid row fails the file
+    short_rows = []
+
+    def _handle_invalid_row(row) -> str:
+        if row.actual_columns < row.expected_columns:
+            short_rows.append(row.text)
+            return "skip"
+        return "error"
+
+    if tsv_stream.peek(1):
+        reader = pv.open_csv(
+            tsv_stream,
+            read_options=pv.ReadOptions(
+                column_names=column_names,
+                block_size=BLOCK_SIZE,
+                use_threads=True,
+            ),
+            parse_options=pv.ParseOptions(
+                delimiter="\t",
+                quote_char='"',
+                newlines_in_values=True,
+                invalid_row_handler=_handle_invalid_row,
+            ),
+            convert_options=_build_convert_options(included_columns),
+        )
+        string_schema = reader.schema
+    else:
+        # Header-only file: Arrow rejects it as empty, so write a 0-row file instead
+        reader = ()
+        string_schema = pa.schema((name, pa.string()) for name in included_columns)
+    schema = _typed_schema(string_schema, date_columns, integer_columns)
+
+    # Write under a temporary name and move the file into place only once complete:
+    # the writer footers the file even when a batch fails, and a truncated but valid
+    # parquet file would otherwise be treated as converted (or loaded from GCS)
+    if filesystem is None:
+        parquet_path = Path(parquet_path)
+        parquet_path.parent.mkdir(parents=True, exist_ok=True)
+        write_path = parquet_path.with_name(f"{parquet_path.name}.tmp")
+    else:
+        write_path = f"{parquet_path}.tmp"
+
+    def _padded_short_rows():
+        """Take the short rows collected so far and yield them as one padded batch."""
+        if short_rows:
+            rows, short_rows[:] = short_rows[:], []
+            print(f"{log_prefix} – padding {len(rows)} rows with missing fields")
+            yield _pad_short_rows(rows, column_names, string_schema)
+
+    def _record_batches():
+        """Yield the reader's batches, each followed by the short rows found so far."""
+        for batch in reader:
+            yield batch
+            yield from _padded_short_rows()
+        # Short rows in a block that produced no batch (e.g. every row was short)
+        yield from _padded_short_rows()
+
+    string_columns = _string_column_indices(string_schema)
+    n_rows = 0
     try:
-        for i, chunk in enumerate(reader):
-            print(f"{log_prefix} – chunk {i}, shape={chunk.shape}")
-            chunk = _apply_column_limit(chunk)
-            chunk = _strip_outer_quotes(chunk)
-            chunk = _parse_date_columns(chunk, date_columns)
-            chunk = _parse_integer_columns(chunk, integer_columns)
-
-            table = pa.Table.from_pandas(chunk, preserve_index=False)
-            if writer is None:
-                parquet_path.parent.mkdir(parents=True, exist_ok=True)
-                writer = pq.ParquetWriter(parquet_path, table.schema)
-            writer.write_table(table)
-    finally:
-        if writer is not None:
-            writer.close()
+        with pq.ParquetWriter(
+            write_path, schema, filesystem=filesystem, **PARQUET_WRITER_OPTIONS
+        ) as writer:
+            for i, batch in enumerate(_record_batches()):
+                print(f"{log_prefix} – batch {i}, rows={batch.num_rows}")
+                batch = _strip_outer_quotes(batch, string_columns)
+                writer.write_batch(
+                    _parse_typed_columns(batch, schema), row_group_size=ROW_GROUP_SIZE
+                )
+                n_rows += batch.num_rows
+    except BaseException:
+        if filesystem is None:
+            write_path.unlink(missing_ok=True)
+        else:
+            try:
+                filesystem.delete_file(write_path)
+            except OSError:
+                pass
+        raise
+
+    if filesystem is None:
+        os.replace(write_path, parquet_path)
+    else:
+        filesystem.move(write_path, parquet_path)
+
+    return n_rows, len(schema)
 
 
 def _convert_member_to_parquet(
     zip_ref: zipfile.ZipFile,
     member: zipfile.ZipInfo,
     table_name: str,
-    parquet_path: Path,
+    parquet_path: Union[Path, str],
     log_file,
     dataset: str,
+    filesystem: Optional[pafs.FileSystem] = None,
 ) -> None:
-    """Convert a single TSV member inside a zip to Parquet (streaming or in-memory)."""
+    """Convert a single TSV member inside a zip to Parquet."""
     log_prefix = f"{member.filename}"
     
     # Get column types from schema if available
     date_columns, integer_columns = _get_column_types(table_name, dataset)
 
-    # Decide whether to stream based on uncompressed size
-    use_streaming = member.file_size >= SIZE_THRESHOLD_BYTES
-
     with zip_ref.open(member) as tsv_file:
-        tsv_data = io.TextIOWrapper(tsv_file, encoding="utf-8")
+        n_rows, n_cols = _write_parquet_streaming(
+            tsv_stream=tsv_file,
+            parquet_path=parquet_path,
+            log_prefix=log_prefix,
+            date_columns=date_columns,
+            integer_columns=integer_columns,
+            filesystem=filesystem,
+        )
 
-        if use_streaming:
-            # For very wide / heavy text columns, smaller chunksize helps
-            # Heuristic tweak for "abstract" columns (large strings)
-            lower_chunksize = 100_000 if "abstract" in table_name else DEFAULT_CHUNKSIZE
+    log_file.write(
+        f"{table_name}: ARROW (size={member.file_size} bytes, rows={n_rows}, cols={n_cols})\n"
+    )
+    print(f"Converted {member.filename} to {parquet_path}")
 
-            print(f"{log_prefix}: using streaming conversion (size={member.file_size} bytes).")
-            log_file.write(
-                f"{table_name}: STREAMING (size={member.file_size} bytes, chunksize={lower_chunksize})\n"
-            )
-            _write_parquet_streaming(
-                tsv_stream=tsv_data,
-                parquet_path=parquet_path,
-                log_prefix=log_prefix,
-                chunksize=lower_chunksize,
-                date_columns=date_columns,
-                integer_columns=integer_columns,
-            )
-            print(f"Converted {member.filename} (streaming) to {parquet_path}")
-        else:
-            # In-memory path for smaller TSVs
-            df = pd.read_csv(
-                tsv_data,
-                sep="\t",
-                quoting=csv.QUOTE_MINIMAL,
-                engine="python",
-                dtype=str,
-                keep_default_na=False,
-                na_values=[],
-            )
 
-            print(f"Loaded DataFrame with shape {df.shape}")
-            print(f"Columns: {df.columns.tolist()}")
+def _record_in_manifest(converted_dir: Path, parquet: Path) -> None:
+    """Append a converted parquet file to the manifest read by task_04.
+
+    Files are recorded by name, relative to ``converted_dir``, so the manifest stays
+    valid if the checkout moves. When the manifest doesn't exist yet, it is seeded
+    with every parquet file already in ``converted_dir``, so files converted before
+    it still get uploaded.
+    """
+    manifest = converted_dir / PARQUET_MANIFEST
+    if manifest.exists():
+        names = [parquet.name]
+    else:
+        with os.scandir(converted_dir) as entries:
+            names = [
+                entry.name
+                for entry in entries
+                if entry.name.endswith(".parquet") and entry.is_file()
+            ]
+
+    with open(manifest, "a", encoding="utf-8") as f:
+        f.writelines(json.dumps({"parquet": name}) + "\n" for name in names)
+
+
+def _convert_zip(
+    zip_path: Path,
+    table: str,
+    parquet: Path,
+    dataset: str,
+    gcs_marker: Optional[Path] = None,
+) -> None:
+    """Convert a zip file to parquet, processing all TSV members.
+
+    Kept at module level so pytask-parallel can ship it to worker processes
+    (``pytask -n <N>``); each zip is independent of the others.
 
-            df = _apply_column_limit(df)
-            df = _strip_outer_quotes(df)
-            df = _parse_date_columns(df, date_columns)
-            df = _parse_integer_columns(df, integer_columns)
+    If ``gcs_marker`` is given, the parquet file is written to the dataset's GCS
+    parquet bucket under ``parquet.name`` instead of locally, and the marker is
+    touched once the write succeeds.
+    """
+    # Skip if already converted
+    done = gcs_marker if gcs_marker is not None else parquet
+    if done.exists():
+        print(f"Skipping {parquet.name} (already converted)")
+        return
+
+    if gcs_marker is not None:
+        destination = f"{get_gcs_bucket(dataset, suffix='_parquet')}/{parquet.name}"
+        filesystem = pafs.GcsFileSystem()
+    else:
+        destination = parquet
+        filesystem = None
+    
+    dataset_converted_dir = BLD / "converted" / dataset
+    dataset_converted_dir.mkdir(parents=True, exist_ok=True)
+    
+    log_path = dataset_converted_dir / "conversion_log.txt"
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        print(f"[{dataset}] Extracting and converting {zip_path.name}")
+        
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                # Find all TSV members
+                members = [m for m in zip_ref.infolist() if m.filename.endswith(".tsv")]
+                
+                if not members:
+                    raise ValueError(f"No TSV members found in {zip_path}")
+                
+                # Process each TSV member (typically just one)
+                for member in members:
+                    _convert_member_to_parquet(
+                        zip_ref=zip_ref,
+                        member=member,
+                        table_name=table,
+                        parquet_path=destination,
+                        log_file=log_file,
+                        dataset=dataset,
+                        filesystem=filesystem,
+                    )
+
+            if gcs_marker is not None:
+                gcs_marker.parent.mkdir(parents=True, exist_ok=True)
+                gcs_marker.touch()
+            else:
+                # Record the file so task_04 can find it without listing the directory
+                _record_in_manifest(dataset_converted_dir, parquet)
+            
+            print(f"Conversion complete: {destination}")
+        
+        except Exception as e:
+            log_file.write(f"{zip_path.name}: ERROR - {e}\n")
+            print(f"[{dataset}] Failed to convert {zip_path}: {e}")
+            raise
 
-            parquet_path.parent.mkdir(parents=True, exist_ok=True)
-            df.to_parquet(parquet_path, index=False)
-            log_file.write(
-                f"{table_name}: IN_MEMORY (size={member.file_size} bytes, rows={df.shape[0]}, cols={df.shape[1]})\n"
-            )
-            print(f"Converted {member.filename} to {parquet_path} (in-memory)")
 
 @task(is_generator=True)
 def task_extract_to_parquet() -> None:
@@ -263,6 +458,27 @@ def task_extract_to_parquet() -> None:
             versioned_name = f"{table_name}_{VERSION}"
             parquet_path = converted_dir / f"{versioned_name}.parquet"
 
+            if PARQUET_TO_GCS:
+                marker_file = marker_dir / f"{parquet_path.name}.uploaded"
+
+                # Skip if already written to GCS
+                if marker_file.exists():
+                    continue
+
+                @task
+                def convert_zip_to_gcs(
+                    zip_path: Path = zip_file,
+                    table: str = table_name,
+                    parquet_name: str = parquet_path.name,
+                    dataset: str = dataset_name,
+                    marker: Annotated[Path, Product] = marker_file,
+                ) -> None:
+                    """Convert a zip file to parquet written directly to GCS."""
+                    parquet = BLD / "converted" / dataset / parquet_name
+                    _convert_zip(zip_path, table, parquet, dataset, gcs_marker=marker)
+
+                continue
+
             # Skip if already converted
             if parquet_path.exists():
                 continue
@@ -276,40 +492,4 @@ def task_extract_to_parquet() -> None:
                 dataset: str = dataset_name,
             ) -> None:
                 """Convert a zip file to parquet, processing all TSV members."""
-                # Skip if already converted
-                if parquet.exists():
-                    print(f"Skipping {parquet.name} (already converted)")
-                    return
-                
-                dataset_converted_dir = BLD / "converted" / dataset
-                dataset_converted_dir.mkdir(parents=True, exist_ok=True)
-                
-                log_path = dataset_converted_dir / "conversion_log.txt"
-                with open(log_path, "a", encoding="utf-8") as log_file:
-                    print(f"[{dataset}] Extracting and converting {zip_path.name}")
-                    
-                    try:
-                        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                            # Find all TSV members
-                            members = [m for m in zip_ref.infolist() if m.filename.endswith(".tsv")]
-                            
-                            if not members:
-                                raise ValueError(f"No TSV members found in {zip_path}")
-                            
-                            # Process each TSV member (typically just one)
-                            for member in members:
-                                _convert_member_to_parquet(
-                                    zip_ref=zip_ref,
-                                    member=member,
-                                    table_name=table,
-                                    parquet_path=parquet,
-                                    log_file=log_file,
-                                    dataset=dataset,
-                                )
-                        
-                        print(f"Conversion complete: {parquet}")
-                    
-                    except Exception as e:
-                        log_file.write(f"{zip_path.name}: ERROR - {e}\n")
-                        print(f"[{dataset}] Failed to convert {zip_path}: {e}")
-                        raise
+                _convert_zip(zip_path, table, parquet, dataset)
@@ -1,12 +1,14 @@
 """Task for uploading converted data to Google Cloud Storage."""
+import functools
+import json
 import pytask
-import subprocess
 from pathlib import Path
 from typing import Annotated
 import os
 
+from google.cloud import storage
 from pytask import Product, task
-from ..config import BLD, get_gcs_bucket
+from ..config import BLD, BQ_PROJECT_ID, PARQUET_MANIFEST, get_gcs_bucket
 
 # Get dataset from env var or default to 'granted'
 DATASET = os.getenv("CONFIG_TYPE", "granted")
@@ -14,6 +16,40 @@ converted_dir = BLD / "converted" / DATASET
 gcs_parquet_bucket = get_gcs_bucket(DATASET, suffix="_parquet")
 marker_dir = BLD / "gcs"
 
+# Resumable upload chunk size (must be a multiple of 256 KB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@functools.cache
+def get_storage_client() -> storage.Client:
+    """Return a GCS client shared by all uploads in this process."""
+    return storage.Client(project=BQ_PROJECT_ID)
+
+
+def list_parquet_files() -> list[Path]:
+    """List converted parquet files, using task_02's manifest when it exists."""
+    manifest = converted_dir / PARQUET_MANIFEST
+    if manifest.exists():
+        with open(manifest, encoding="utf-8") as f:
+            # Entries are resolved against converted_dir (older manifests stored absolute
+            # paths); a file converted more than once is listed once
+            paths = dict.fromkeys(
+                converted_dir / Path(json.loads(line)["parquet"]).name
+                for line in f
+                if line.strip()
+            )
+        return [path for path in paths if path.exists()]
+
+    if not converted_dir.exists():
+        return []
+    with os.scandir(converted_dir) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".parquet") and entry.is_file()
+        ]
+
+
 #@pytask.mark.skip()
 @task(is_generator=True)
 def task_upload_parquet_to_gcs() -> None:
@@ -24,7 +60,7 @@ def task_upload_parquet_to_gcs() -> None:
     marker_dir.mkdir(parents=True, exist_ok=True)
 
     # Get all parquet files
-    parquet_files = list(converted_dir.glob("*.parquet"))
+    parquet_files = list_parquet_files()
 
     # Limit number of files if MAX_FILES is set
     max_files = os.environ.get("MAX_FILES")
@@ -47,7 +83,11 @@ def task_upload_parquet_to_gcs() -> None:
                 return
 
             print(f"Uploading {local_file} to {gcs_bucket_path}")
-            subprocess.run(['gcloud', 'storage', 'cp', str(local_file), gcs_bucket_path], check=True)
+            bucket_name, _, prefix = gcs_parquet_bucket.partition("/")
+            blob = get_storage_client().bucket(bucket_name).blob(
+                f"{prefix}/{local_file.name}", chunk_size=UPLOAD_CHUNK_SIZE
+            )
+            blob.upload_from_filename(str(local_file))
 
             # Create marker file to indicate successful upload
             marker.touch()
@@ -1,10 +1,14 @@
 """Task for collecting metadata about patent tables."""
 import pytask
+import hashlib
 import json
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import os
 
 from ..config import DATASETS, BLD
@@ -12,40 +16,83 @@ from ..config import DATASETS, BLD
 # Get dataset from env var or default to 'granted'
 DATASET = os.getenv("CONFIG_TYPE", "granted")
 metadata_dir = BLD / "metadata" / DATASET
+http_cache_dir = metadata_dir / "http_cache"
 base_url = DATASETS[DATASET]["base_url"]
 dict_url = DATASETS[DATASET]["dict_url"]
 
-def fetch_table_descriptions(url: str) -> Dict[str, str]:
-    """Fetch table descriptions from PatentsView website."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers)
+# Shared session so both PatentsView pages reuse one keep-alive connection
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
+# Only build the parts of the pages the parsers read
+_TABLE_ROWS = SoupStrainer("tr")
+_DICT_TABLES = SoupStrainer(["table", "tr", "td"])
+
+def fetch_page(url: str, session: requests.Session = _SESSION) -> Tuple[bytes, Optional[str]]:
+    """Fetch a page, re-using the cached body when the server answers 304 Not Modified.
+
+    The body and its ETag / Last-Modified headers are kept in http_cache_dir.
+
+    Returns:
+        Tuple of (raw body, charset declared in the Content-Type header or None).
+        The raw bytes go straight to lxml, which sniffs <meta charset> itself
+        when no charset was declared.
+    """
+    key = hashlib.sha256(url.encode()).hexdigest()[:16]
+    body_path = http_cache_dir / f"{key}.html"
+    headers_path = http_cache_dir / f"{key}.json"
+
+    headers = {}
+    cached = {}
+    if body_path.exists() and headers_path.exists():
+        cached = json.loads(headers_path.read_text())
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = session.get(url, headers=headers)
+    if headers and response.status_code == 304:
+        print(f"{url} not modified, using cached copy")
+        return body_path.read_bytes(), cached.get("encoding")
     response.raise_for_status()
-    
-    soup = BeautifulSoup(response.text, "html.parser")
+
+    # requests falls back to ISO-8859-1 for text/html, so only trust an explicit charset
+    content_type = response.headers.get("Content-Type", "")
+    encoding = response.encoding if "charset" in content_type.lower() else None
+
+    http_cache_dir.mkdir(parents=True, exist_ok=True)
+    body_path.write_bytes(response.content)
+    headers_path.write_text(json.dumps({
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "encoding": encoding,
+    }, indent=2))
+    return response.content, encoding
+
+def fetch_table_descriptions(url: str, session: requests.Session = _SESSION) -> Dict[str, str]:
+    """Fetch table descriptions from PatentsView website."""
+    body, encoding = fetch_page(url, session)
+    soup = BeautifulSoup(body, "lxml", from_encoding=encoding, parse_only=_TABLE_ROWS)
     descriptions = {}
     
     for table in soup.find_all("tr"):
-        cells = table.find_all("td")
-        if len(cells) >= 2:
+        cells = table.find_all("td", limit=2)
+        if len(cells) == 2:
             table_name = cells[0].text.strip()
             description = cells[1].text.strip()
             descriptions[table_name] = description
             
     return descriptions
 
-def fetch_variable_descriptions(url: str) -> Dict[str, List[Dict]]:
+def fetch_variable_descriptions(url: str, session: requests.Session = _SESSION) -> Dict[str, List[Dict]]:
     """Fetch variable descriptions from PatentsView website."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    
-    soup = BeautifulSoup(response.text, "html.parser")
+    body, encoding = fetch_page(url, session)
+    soup = BeautifulSoup(body, "lxml", from_encoding=encoding, parse_only=_DICT_TABLES)
     variable_descriptions = {}
     
     for table in soup.find_all("table"):
@@ -54,14 +101,15 @@ def fetch_variable_descriptions(url: str) -> Dict[str, List[Dict]]:
         variables = []
         
         for row in rows:
-            cells = row.find_all("td")
+            # Only the first two cells are used, so stop scanning after them
+            cells = row.find_all("td", limit=2)
             
             if 'table-head' in row.get('class', []):
                 if dataset_name and variables:
                     variable_descriptions[dataset_name] = variables
                     variables = []
                 dataset_name = cells[0].get_text(strip=True)
-            elif len(cells) >= 2 and dataset_name:
+            elif len(cells) == 2 and dataset_name:
                 variable_name = cells[0].get_text(strip=True)
                 description = cells[1].get_text(strip=True)
                 
@@ -88,13 +136,17 @@ def task_collect_metadata(
     """Collect table and variable descriptions."""
     metadata_dir.mkdir(parents=True, exist_ok=True)
 
-    # Fetch descriptions
-    table_descriptions = fetch_table_descriptions(base_url)
-    variable_descriptions = fetch_variable_descriptions(dict_url)
+    # Fetch both pages concurrently over the shared session
+    with _SESSION, ThreadPoolExecutor(max_workers=2) as executor:
+        tables_future = executor.submit(fetch_table_descriptions, base_url)
+        variables_future = executor.submit(fetch_variable_descriptions, dict_url)
+        table_descriptions = tables_future.result()
+        variable_descriptions = variables_future.result()
     
     # Save to files
-    with open(produces["tables"], 'w') as f:
-        json.dump(table_descriptions, f, indent=2)
-    
-    with open(produces["variables"], 'w') as f:
-        json.dump(variable_descriptions, f, indent=2)
+    Path(produces["tables"]).write_bytes(
+        orjson.dumps(table_descriptions, option=orjson.OPT_INDENT_2)
+    )
+    Path(produces["variables"]).write_bytes(
+        orjson.dumps(variable_descriptions, option=orjson.OPT_INDENT_2)
+    )
@@ -1,10 +1,14 @@
 """Task for creating BigQuery tables from GCS parquet files."""
+import functools
+import hashlib
 import pytask
-import subprocess
+import threading
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Optional
 import os
 
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import bigquery, storage
 from pytask import Product, task
 from ..config import BLD, BQ_PROJECT_ID, DATASETS, get_gcs_bucket, RESOURCES, VERSION
 
@@ -15,34 +19,57 @@ gcs_parquet_bucket = get_gcs_bucket(DATASET, suffix="_parquet")
 bq_dataset = DATASETS[DATASET]["bq_dataset"]
 schema_dir = RESOURCES / "patentsview_schemas" / DATASET
 
+# Cap on load jobs waited on at once when tasks run in parallel (pytask -n);
+# keeps well under BigQuery's per-project concurrent load job quota
+MAX_CONCURRENT_LOADS = 16
+_load_slots = threading.BoundedSemaphore(MAX_CONCURRENT_LOADS)
+
+
+@functools.cache
+def get_bq_client() -> bigquery.Client:
+    """Return a BigQuery client shared by all tasks in this process."""
+    return bigquery.Client(project=BQ_PROJECT_ID)
+
+
+@functools.cache
+def list_gcs_parquet_files() -> frozenset[str]:
+    """List gs:// URIs in this dataset's parquet bucket, once per process."""
+    bucket_name, _, prefix = gcs_parquet_bucket.partition("/")
+    client = storage.Client(project=BQ_PROJECT_ID)
+    return frozenset(
+        f"gs://{bucket_name}/{blob.name}"
+        for blob in client.list_blobs(bucket_name, prefix=f"{prefix}/")
+    )
+
+
 #@pytask.mark.skip()
 @task(is_generator=True)
 def task_create_bq_from_gcs() -> None:
     """Generate tasks to create BigQuery tables from uploaded GCS parquet files."""
     marker_dir.mkdir(parents=True, exist_ok=True)
     
+    # Map base table name -> schema file, listing the schema directory once
+    schema_map = {
+        path.stem.removeprefix("schema_"): path for path in schema_dir.glob("schema_*.json")
+    }
+    version_suffix = f"_{VERSION}"
+    
     # Get all marker files (indicates successful upload)
     marker_files = list(marker_dir.glob("*.parquet.uploaded"))
     
     for marker_file in marker_files:
         # Extract parquet filename from marker (remove .uploaded suffix)
-        parquet_filename = marker_file.name.replace(".uploaded", "")
+        parquet_filename = marker_file.name.removesuffix(".uploaded")
         # Table name is the filename without .parquet extension
-        table_name = parquet_filename.replace(".parquet", "")
+        table_name = parquet_filename.removesuffix(".parquet")
         
         # Extract base table name (remove version suffix if present)
         # e.g., g_patent_20250909 -> g_patent
-        base_table_name = table_name
-        version_suffix = f"_{VERSION}"
-        if table_name.endswith(version_suffix):
-            base_table_name = table_name[:-len(version_suffix)]
-        
-        # Look for schema file
-        schema_file_path = schema_dir / f"schema_{base_table_name}.json"
+        base_table_name = table_name.removesuffix(version_suffix)
         
         # GCS path to the parquet file
         gcs_file_path = f"gs://{gcs_parquet_bucket}/{parquet_filename}"
-        # BigQuery table ID: dataset.table_name (project specified via --project_id flag)
+        # BigQuery table ID: dataset.table_name (project taken from the BigQuery client)
         bq_table_id = f"{bq_dataset}.{table_name}"
         
         # Marker file to track successful table creation
@@ -54,11 +81,19 @@ def task_create_bq_from_gcs() -> None:
             gcs_path: str = gcs_file_path,
             table_id: str = bq_table_id,
             bq_marker: Annotated[Path, Product] = bq_marker_file,
-            base_name: str = base_table_name,
+            schema_file: Optional[Path] = schema_map.get(base_table_name),
         ) -> None:
             """Create a BigQuery table from a GCS parquet file."""
-            # Skip if table already created
-            if bq_marker.exists():
+            # The marker records a hash of the schema the table was loaded with, so
+            # editing the schema file reloads the table instead of skipping it
+            schema_hash = (
+                hashlib.sha256(schema_file.read_bytes()).hexdigest()
+                if schema_file is not None
+                else ""
+            )
+
+            # Skip if table already created with this schema
+            if bq_marker.exists() and bq_marker.read_text() == schema_hash:
                 print(f"Skipping {table_id} (already created)")
                 return
             
@@ -68,54 +103,34 @@ def task_create_bq_from_gcs() -> None:
                 return
             
             # Check if file exists in GCS (skip if from different dataset)
-            try:
-                subprocess.run(
-                    ['gsutil', 'ls', gcs_path],
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-            except subprocess.CalledProcessError:
+            if gcs_path not in list_gcs_parquet_files():
                 print(f"File '{gcs_path}' not found in GCS. Skipping (may be from different dataset).")
                 return
             
-            # Check for schema file
-            schema_file = schema_dir / f"schema_{base_name}.json"
-            use_schema = schema_file.exists()
+            # Use the schema file if there is one for this table
+            use_schema = schema_file is not None
             
-            # Build BigQuery load command
+            # Build BigQuery load job (replaces the table, like bq load --replace)
+            client = get_bq_client()
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.PARQUET,
+                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            )
             if use_schema:
                 print(f"Creating BigQuery table {table_id} from {gcs_path} with schema {schema_file}")
-                bq_load_command = [
-                    'bq', 'load',
-                    '--source_format=PARQUET',
-                    '--replace',
-                    f'--project_id={BQ_PROJECT_ID}',
-                    f'--schema={schema_file}',
-                    table_id,
-                    gcs_path
-                ]
+                job_config.schema = client.schema_from_json(schema_file)
             else:
                 print(f"Creating BigQuery table {table_id} from {gcs_path} (auto-detecting schema)")
-                bq_load_command = [
-                    'bq', 'load',
-                    '--source_format=PARQUET',
-                    '--replace',
-                    '--autodetect',
-                    f'--project_id={BQ_PROJECT_ID}',
-                    table_id,
-                    gcs_path
-                ]
-            
-            # Print command for manual debugging
-            print(f"Running: {' '.join(str(x) for x in bq_load_command)}")
+                job_config.autodetect = True
 
             try:
-                subprocess.run(bq_load_command, check=True)
+                with _load_slots:
+                    job = client.load_table_from_uri(gcs_path, table_id, job_config=job_config)
+                    print(f"Started load job {job.job_id} for {table_id}")
+                    job.result()
                 # Create marker file to indicate successful table creation
-                bq_marker.touch()
+                bq_marker.write_text(schema_hash)
                 print(f"Successfully created table {table_id}")
-            except subprocess.CalledProcessError as e:
+            except GoogleAPICallError as e:
                 print(f"Error creating table {table_id}: {e}")
                 raise
-
@@ -1,10 +1,14 @@
 """Task for applying table descriptions to BigQuery tables."""
-import json
-import subprocess
+import functools
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 import re
 
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import bigquery
+
 from ..config import DATASETS, BQ_PROJECT_ID, VERSION, RESOURCES
 
 # Get dataset from env var or default to 'granted'
@@ -12,18 +16,51 @@ DATASET = os.getenv("CONFIG_TYPE", "granted")
 metadata_dir = RESOURCES / "metadata" / DATASET
 bq_dataset = DATASETS[DATASET]["bq_dataset"]
 
+# Number of description updates sent to BigQuery at once
+MAX_WORKERS = 16
+
+# Characters not allowed in descriptions, and runs of whitespace
+_DISALLOWED_CHARS = re.compile(r'[^\w\s.,;:()\-]')
+_WHITESPACE = re.compile(r'\s+')
+# str.translate table blanking the same ASCII characters as _DISALLOWED_CHARS
+_ASCII_BLANKS = {c: ' ' for c in range(128) if _DISALLOWED_CHARS.match(chr(c))}
+
+
+@functools.cache
+def get_bq_client() -> bigquery.Client:
+    """Return a BigQuery client shared by all calls in this process."""
+    return bigquery.Client(project=BQ_PROJECT_ID)
+
 
 def clean_table_description(description):
     """Clean up table description for BigQuery."""
     # Replace newlines with spaces
     description = description.replace('\n', ' ')
-    # Remove any problematic characters
-    description = re.sub(r'[^\w\s.,;:()\-]', ' ', description)
+    # Remove any problematic characters (the regex is only needed for non-ASCII text)
+    description = description.translate(_ASCII_BLANKS)
+    if not description.isascii():
+        description = _DISALLOWED_CHARS.sub(' ', description)
     # Trim extra spaces
-    description = re.sub(r'\s+', ' ', description).strip()
+    description = _WHITESPACE.sub(' ', description).strip()
     return description
 
 
+def apply_table_description(bq_table_name: str, description: str) -> None:
+    """Set the description of a single BigQuery table, unless it already has it."""
+    try:
+        client = get_bq_client()
+        table = client.get_table(bq_table_name)
+        if (table.description or "").strip() == description:
+            print(f"Description for {bq_table_name} is up to date")
+            return
+
+        print(f"Updating description for {bq_table_name}")
+        table.description = description
+        client.update_table(table, ["description"])
+    except GoogleAPICallError as e:
+        print(f"Error updating {bq_table_name}: {e}")
+
+
 def task_apply_table_descriptions(
     tables_file: Path = metadata_dir / "table_descriptions.json",
 ) -> None:
@@ -36,8 +73,7 @@ def task_apply_table_descriptions(
         MAX_TABLES: Maximum number of tables to process (optional)
     """
     # Load metadata
-    with open(tables_file) as f:
-        raw_table_descriptions = json.load(f)
+    raw_table_descriptions = orjson.loads(tables_file.read_bytes())
 
     # Parse table descriptions - keys contain "table_name\n\n\nzip:..." format
     table_descriptions = {}
@@ -57,7 +93,8 @@ def task_apply_table_descriptions(
         print(f"Processing only the first {max_tables} tables")
         tables = tables[:max_tables]
 
-    # Apply descriptions
+    # Collect (table, description) pairs to update
+    updates = []
     for table_name in tables:
         # Clean table description
         table_description = clean_table_description(table_descriptions.get(table_name, ""))
@@ -66,17 +103,14 @@ def task_apply_table_descriptions(
         versioned_table_name = f"{table_name}_{VERSION}"
         bq_table_name = f"{bq_dataset}.{versioned_table_name}"
 
-        # Update table description
         if table_description:
-            bq_update_command = [
-                'bq', 'update',
-                '--description', table_description,
-                f'--project_id={BQ_PROJECT_ID}',
-                bq_table_name
-            ]
-
-            try:
-                print(f"Updating description for {bq_table_name}")
-                subprocess.run(bq_update_command, check=True)
-            except subprocess.CalledProcessError as e:
-                print(f"Error updating {table_name}: {e}")
+            updates.append((bq_table_name, table_description))
+
+    # Apply descriptions concurrently; each table is an independent PATCH
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(apply_table_description, bq_table_name, table_description)
+            for bq_table_name, table_description in updates
+        ]
+        for future in futures:
+            future.result()
@@ -1,7 +1,9 @@
 """Task for making BigQuery tables publicly accessible."""
-import json
-import subprocess
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import bigquery
 
 from ..config import DATASETS, BQ_PROJECT_ID, VERSION
 
@@ -12,6 +14,24 @@ bq_dataset = DATASETS[DATASET]["bq_dataset"]
 ROLE = "roles/bigquery.dataViewer"
 MEMBER = "allUsers"
 
+# Number of tables whose IAM policy is updated at once
+MAX_WORKERS = 16
+
+
+def grant_public_access(client: bigquery.Client, table_ref: bigquery.TableReference) -> None:
+    """Add the MEMBER/ROLE binding to a table's IAM policy unless it is already there."""
+    print(f"Applying IAM binding to {table_ref} ...")
+    try:
+        policy = client.get_iam_policy(table_ref)
+        for binding in policy.bindings:
+            if binding["role"] == ROLE and MEMBER in binding["members"]:
+                return
+        policy.bindings.append({"role": ROLE, "members": {MEMBER}})
+        client.set_iam_policy(table_ref, policy)
+    except GoogleAPICallError as e:
+        print(f"Error applying IAM binding to {table_ref}: {e}")
+        raise
+
 
 def task_make_tables_public() -> None:
     """Grant allUsers dataViewer access on every table/view in the dataset.
@@ -19,57 +39,29 @@ def task_make_tables_public() -> None:
     Environment Variables:
         CONFIG_TYPE: Dataset to process (granted, pregrant, beta). Default: granted.
     """
-    # List tables in the dataset
-    result = subprocess.run(
-        [
-            "bq",
-            "ls",
-            f"--project_id={BQ_PROJECT_ID}",
-            "--format=prettyjson",
-            bq_dataset,
-        ],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-
-    tables_json = json.loads(result.stdout)
+    client = bigquery.Client(project=BQ_PROJECT_ID)
 
-    # Filter to tables, views, and materialized views matching the current VERSION
-    table_ids = [
-        entry["tableReference"]["tableId"]
-        for entry in tables_json
-        if entry.get("type") in ("TABLE", "VIEW", "MATERIALIZED_VIEW")
-        and entry["tableReference"]["tableId"].endswith(f"_{VERSION}")
+    # List tables in the dataset (list_tables pages through every result), keeping
+    # tables, views, and materialized views matching the current VERSION
+    version_suffix = f"_{VERSION}"
+    table_refs = [
+        table.reference
+        for table in client.list_tables(bq_dataset)
+        if table.table_type in ("TABLE", "VIEW", "MATERIALIZED_VIEW")
+        and table.table_id.endswith(version_suffix)
     ]
 
-    if not table_ids:
+    if not table_refs:
         print(f"No tables/views found in {BQ_PROJECT_ID}:{bq_dataset}")
         return
 
-    print(f"Found {len(table_ids)} tables/views in {BQ_PROJECT_ID}:{bq_dataset}")
+    print(f"Found {len(table_refs)} tables/views in {BQ_PROJECT_ID}:{bq_dataset}")
 
-    for table_id in table_ids:
-        full = f"{BQ_PROJECT_ID}:{bq_dataset}.{table_id}"
-        print(f"Applying IAM binding to {full} ...")
-        try:
-            subprocess.run(
-                [
-                    "bq",
-                    "add-iam-policy-binding",
-                    f"--member={MEMBER}",
-                    f"--role={ROLE}",
-                    full,
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"Error applying IAM binding to {full}: {e}")
-            raise
+    # Each table has its own IAM policy, so the bindings can be applied concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(lambda table_ref: grant_public_access(client, table_ref), table_refs))
 
     print(
-        f"Done: applied {ROLE} for {MEMBER} on {len(table_ids)} resources "
+        f"Done: applied {ROLE} for {MEMBER} on {len(table_refs)} resources "
         f"in {BQ_PROJECT_ID}:{bq_dataset}"
     )
@@ -0,0 +1,85 @@
+"""Tests for the TSV to Parquet conversion."""
+import datetime
+import zipfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from patentsview_gbq.tasks import task_02_extract_to_parquet as task_02
+
+
+@pytest.fixture
+def convert(tmp_path, monkeypatch):
+    """Zip a TSV, convert it with the granted schemas and return the Parquet table."""
+    monkeypatch.setattr(task_02, "BLD", tmp_path)
+
+    def _convert(table: str, tsv: str) -> pa.Table:
+        zip_path = tmp_path / f"{table}.tsv.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr(f"{table}.tsv", tsv)
+        parquet = tmp_path / "converted" / "granted" / f"{table}.parquet"
+        task_02._convert_zip(zip_path, table, parquet, "granted")
+        return pq.read_table(parquet)
+
+    return _convert
+
+
+def test_invalid_dates_become_null(convert):
+    tsv = (
+        "patent_id\tpatent_type\tpatent_date\n"
+        "1\tutility\t1976-01-06\n"
+        "2\tutility\t1976-01-00\n"
+        '3\tutility\t"2020-02-30"\n'
+        "4\tutility\t\n"
+        "5\tutility\t1976-1-6\n"
+    )
+    table = convert("g_patent", tsv)
+
+    assert table.schema.field("patent_date").type == pa.date32()
+    assert table.column("patent_date").to_pylist() == [
+        datetime.date(1976, 1, 6), None, None, None, datetime.date(1976, 1, 6)
+    ]
+
+
+def test_text_in_integer_columns_becomes_null(convert):
+    # The schemas type some text columns (country, county) as INTEGER
+    tsv = (
+        "location_id\tdisambig_city\tdisambig_state\tdisambig_country\tlatitude\t"
+        "longitude\tcounty\tstate_fips\tcounty_fips\n"
+        "loc1\tBoston\tMA\tUS\t42.36\t-71.06\tSuffolk\t25\t025\n"
+        "loc2\tParis\t\tFR\t48.86\t2.35\t\t\t\n"
+        "loc3\tAustin\tTX\tUS\t30.27\t-97.74\tTravis\t48\t+5\n"
+        "loc4\tDallas\tTX\tUS\t32.78\t-96.80\tDallas\t48\t12.0\n"
+    )
+    table = convert("g_location_disambiguated", tsv)
+
+    assert table.schema.field("disambig_country").type == pa.int64()
+    assert table.column("disambig_country").to_pylist() == [None] * 4
+    assert table.column("county").to_pylist() == [None] * 4
+    assert table.column("county_fips").to_pylist() == [25, None, 5, 12]
+    assert table.column("disambig_city").to_pylist() == ["Boston", "Paris", "Austin", "Dallas"]
+
+
+def test_header_only_file_writes_empty_parquet(convert):
+    table = convert("g_patent", "patent_id\tpatent_type\tpatent_date\n")
+
+    assert table.num_rows == 0
+    assert table.column_names == ["patent_id", "patent_type", "patent_date"]
+    assert table.schema.field("patent_date").type == pa.date32()
+
+
+def test_short_rows_are_padded_with_nulls(convert):
+    tsv = (
+        "patent_id\tpatent_type\tpatent_date\n"
+        "1\tutility\t1976-01-06\n"
+        "2\tdesign\n"
+        '"3"\n'
+    )
+    table = convert("g_patent", tsv)
+
+    assert table.to_pylist() == [
+        {"patent_id": "1", "patent_type": "utility", "patent_date": datetime.date(1976, 1, 6)},
+        {"patent_id": "2", "patent_type": "design", "patent_date": None},
+        {"patent_id": "3", "patent_type": None, "patent_date": None},
+    ]